@@ -1,14 +1,28 @@
 # app.py
-import json
+import atexit
+import heapq
+import math
 import os
 import threading
+import time
 import uuid
+from collections import OrderedDict
 import random
 import string
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Sequence, NamedTuple, FrozenSet
 
-from flask import Flask, request, jsonify, make_response, url_for
+import numpy as np
+import orjson
+from flask import Flask, Response, request, make_response, url_for
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the range filter falls back to plain NumPy
+    njit = None
 
 app = Flask(__name__)
 
@@ -16,17 +30,42 @@ app = Flask(__name__)
 # Storage (in-memory + JSON file)
 # ----------------------------
 DATA_FILE = "data.json"
-STORE_LOCK = threading.Lock()
-ITEMS: List[Dict[str, Any]] = []  # each item is a dict
-
-# Allowed fields in the item (helps validation and "fields" projection)
-ITEM_FIELDS = {
+STORE_LOCK = threading.Lock()  # serializes writers only
+# The published store: one column per item field plus the indexes over them, rows addressed
+# by position (see build_columns). Item dicts only exist at the response boundary (item_dicts).
+# Writers build a new store under STORE_LOCK and rebind it in one assignment; nothing in it is
+# ever mutated, so readers just take `cols = SNAPSHOT` without locking or copying.
+SNAPSHOT: Dict[str, Any] = {}
+STORE_VERSION = 0  # bumped on every write; stamped into the published store as cols["version"]
+
+# Persistence: writes mark the store dirty and a background thread saves it (see _writer_loop)
+SAVE_DELAY = 0.2  # seconds; writes landing within this window go to disk together
+SAVE_LOCK = threading.Lock()  # one data.json write at a time
+_dirty = threading.Event()
+
+# Memoized query results, keyed by store version (see query_positions / _search_mask)
+CACHE_LOCK = threading.Lock()
+QUERY_CACHE: "OrderedDict[tuple, Tuple[np.ndarray, Optional[int]]]" = OrderedDict()
+QUERY_CACHE_SIZE = 256
+SEARCH_CACHE: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+SEARCH_CACHE_SIZE = 64
+
+# Allowed fields in the item (helps validation and "fields" projection), in output order
+ITEM_FIELD_ORDER = (
     "id", "name", "category", "price", "rating", "tags",
-    "created_at", "stock", "vendor", "attributes"
-}
+    "created_at", "stock", "vendor", "attributes",
+)
+ITEM_FIELDS = set(ITEM_FIELD_ORDER)
 
 RANDOM = random.Random(42)  # deterministic seed for reproducibility
 
+# default sort: -created_at (newest first), then name
+DEFAULT_SORT: List[Tuple[str, bool]] = [("created_at", False), ("name", True)]
+# Sort specs whose full order is kept pre-computed in the "order" index
+INDEXED_SORTS: List[Tuple[Tuple[str, bool], ...]] = [tuple(DEFAULT_SORT)] + [
+    ((fname, asc),) for fname in ("price", "rating", "created_at") for asc in (True, False)
+]
+
 
 # ----------------------------
 # Utilities
@@ -36,71 +75,127 @@ def now_iso() -> str:
 
 
 def load_data() -> None:
-    global ITEMS
+    global SNAPSHOT, STORE_VERSION
+    STORE_VERSION += 1
     if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            ITEMS[:] = json.load(f)
+        with open(DATA_FILE, "rb") as f:
+            SNAPSHOT = build_columns(orjson.loads(f.read()), STORE_VERSION)
     else:
         # If no file, generate a sizable deterministic sample dataset for JMeter.
-        generate_sample_data(n=1000)
+        SNAPSHOT = build_columns(generate_sample_data(n=1000), STORE_VERSION)
         save_data()
 
 
 def save_data() -> None:
+    with SAVE_LOCK:
+        _write_snapshot()
+
+
+def _write_snapshot() -> None:
+    """Write the current snapshot to data.json (atomically, via a temp file). Caller holds SAVE_LOCK."""
+    cols = SNAPSHOT
     tmp = DATA_FILE + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(ITEMS, f, ensure_ascii=False)
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(item_dicts(cols, np.arange(len(cols["id"])))))
     os.replace(tmp, DATA_FILE)
 
 
-def generate_name() -> str:
-    adj = ["Swift", "Solid", "Bright", "Prime", "Aero", "Hyper", "Quantum", "Omega", "Nimbus", "Vector"]
-    noun = ["Widget", "Gadget", "Module", "Device", "Kit", "Bundle", "Unit", "Pack", "Core", "Engine"]
-    return f"{RANDOM.choice(adj)} {RANDOM.choice(noun)} {RANDOM.randint(100, 999)}"
+def schedule_save() -> None:
+    """Have the writer thread save the store soon, instead of rewriting data.json inline."""
+    _dirty.set()
 
 
-def generate_tags() -> List[str]:
-    pool = ["new", "sale", "clearance", "eco", "luxury", "budget", "refurb", "popular", "pro", "lite"]
-    n = RANDOM.randint(1, 4)
-    return RANDOM.sample(pool, n)
+def _writer_loop() -> None:
+    """
+    Background writer: once the store is marked dirty, wait SAVE_DELAY for more writes to
+    pile up, then save whatever snapshot is current. A write landing after the clear below
+    marks the store dirty again, so it is never lost, just saved in the next round. A failed
+    save is logged and leaves the store dirty, so the next round retries it.
+    """
+    while True:
+        _dirty.wait()
+        time.sleep(SAVE_DELAY)
+        # Clear and save under SAVE_LOCK, so flush_data never sees "clean" mid-save
+        with SAVE_LOCK:
+            _dirty.clear()
+            try:
+                _write_snapshot()
+            except Exception:
+                _dirty.set()
+                app.logger.exception("Saving %s failed; retrying in the next round", DATA_FILE)
+
+
+def flush_data() -> None:
+    """
+    Save now if a write is still waiting for the writer thread (runs at interpreter exit).
+    Waits out a save the writer has in progress, then saves again only if more is pending.
+    """
+    with SAVE_LOCK:
+        if _dirty.is_set():
+            _dirty.clear()
+            _write_snapshot()
+
+
+SAMPLE_VENDORS = ["Acme Inc.", "Globex", "Initech", "Umbrella", "WayneTech", "Stark Industries", "Tyrell", "Aperture"]
 
 
 def generate_vendor() -> str:
-    vendors = ["Acme Inc.", "Globex", "Initech", "Umbrella", "WayneTech", "Stark Industries", "Tyrell", "Aperture"]
-    return RANDOM.choice(vendors)
+    return RANDOM.choice(SAMPLE_VENDORS)
 
 
-def random_attributes() -> Dict[str, Any]:
+def generate_sample_data(n: int = 500) -> List[Dict[str, Any]]:
+    """
+    Build n items of deterministic but varied data. Every field is drawn for all n items at
+    once from one seeded NumPy generator; the columns are then zipped into the item dicts.
+    """
+    rng = np.random.default_rng(42)
+    adj = ["Swift", "Solid", "Bright", "Prime", "Aero", "Hyper", "Quantum", "Omega", "Nimbus", "Vector"]
+    noun = ["Widget", "Gadget", "Module", "Device", "Kit", "Bundle", "Unit", "Pack", "Core", "Engine"]
+    categories = ["electronics", "home", "outdoors", "toys", "apparel", "office", "beauty"]
+    tag_pool = np.array(["new", "sale", "clearance", "eco", "luxury", "budget", "refurb", "popular", "pro", "lite"])
     colors = ["red", "blue", "green", "black", "white", "silver", "gold"]
     sizes = ["XS", "S", "M", "L", "XL"]
-    return {
-        "color": RANDOM.choice(colors),
-        "size": RANDOM.choice(sizes),
-        "sku": "".join(RANDOM.choice(string.ascii_uppercase + string.digits) for _ in range(8)),
-    }
-
 
-def generate_sample_data(n: int = 500) -> None:
-    """Populate ITEMS with deterministic but varied data."""
-    global ITEMS
-    categories = ["electronics", "home", "outdoors", "toys", "apparel", "office", "beauty"]
-    base_time = datetime(2023, 1, 1)
-    ITEMS.clear()
-    for i in range(n):
-        created = base_time + timedelta(minutes=i * 17)  # spaced-out timestamps
-        item = {
+    names = [
+        f"{a} {b} {k}"
+        for a, b, k in zip(rng.choice(adj, n).tolist(), rng.choice(noun, n).tolist(), rng.integers(100, 1000, n).tolist())
+    ]
+    # 1-4 distinct tags per item: the first k entries of a random permutation of the pool
+    tag_perms = np.argsort(rng.random((n, len(tag_pool))), axis=1)
+    tags = [tag_pool[perm[:k]].tolist() for perm, k in zip(tag_perms, rng.integers(1, 5, n).tolist())]
+    created = np.datetime64("2023-01-01T00:00:00") + np.arange(n) * np.timedelta64(17, "m")  # spaced-out timestamps
+    created_at = [ts + "Z" for ts in np.datetime_as_string(created, unit="s").tolist()]
+    # (n, 8) single characters, viewed as n strings of 8
+    skus = rng.choice(list(string.ascii_uppercase + string.digits), size=(n, 8)).view("<U8").ravel().tolist()
+
+    columns = zip(
+        names,
+        rng.choice(categories, n).tolist(),
+        rng.uniform(5.0, 1500.0, n).round(2).tolist(),
+        rng.uniform(1.0, 5.0, n).round(2).tolist(),
+        tags,
+        created_at,
+        rng.integers(0, 1001, n).tolist(),
+        rng.choice(SAMPLE_VENDORS, n).tolist(),
+        rng.choice(colors, n).tolist(),
+        rng.choice(sizes, n).tolist(),
+        skus,
+    )
+    return [
+        {
             "id": str(uuid.uuid4()),
-            "name": generate_name(),
-            "category": RANDOM.choice(categories),
-            "price": round(RANDOM.uniform(5.0, 1500.0), 2),
-            "rating": round(RANDOM.uniform(1.0, 5.0), 2),
-            "tags": generate_tags(),
-            "created_at": created.isoformat(timespec="seconds") + "Z",
-            "stock": RANDOM.randint(0, 1000),
-            "vendor": generate_vendor(),
-            "attributes": random_attributes(),
+            "name": name,
+            "category": category,
+            "price": price,
+            "rating": rating,
+            "tags": item_tags,
+            "created_at": created_ts,
+            "stock": stock,
+            "vendor": vendor,
+            "attributes": {"color": color, "size": size, "sku": sku},
         }
-        ITEMS.append(item)
+        for name, category, price, rating, item_tags, created_ts, stock, vendor, color, size, sku in columns
+    ]
 
 
 def parse_bool(v: Optional[str]) -> Optional[bool]:
@@ -116,42 +211,549 @@ def coerce_number(v: Any) -> Optional[float]:
         return None
 
 
-def project_fields(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
-    if not fields:
-        return item
-    return {k: v for k, v in item.items() if k in fields}
+def rows_to_dicts(
+    cols: Dict[str, Any], positions: Sequence[int], fields: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Materialize the rows at `positions` as item dicts, with just `fields` (all of them when
+    empty). Each requested column is gathered once for the whole batch, then map() feeds the
+    columns to the compiled row builder side by side: one call per row, no per-row tuple.
+    """
+    fields = tuple(dict.fromkeys(fields)) if fields else ITEM_FIELD_ORDER
+    return list(map(_projector(fields), *(column_values(cols, f, positions) for f in fields)))
+
+
+def item_dicts(
+    cols: Dict[str, Any], positions: Sequence[int], fields: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    rows_to_dicts for what leaves the store (responses, data.json): a raw_rows row comes back
+    exactly as loaded, cut down to the `fields` it has, so nothing in data.json is lost or rewritten.
+    """
+    rows = rows_to_dicts(cols, positions, fields)
+    raw = cols["raw_rows"]
+    if raw:
+        for i in np.flatnonzero(np.isin(positions, list(raw))).tolist():
+            item = raw[int(positions[i])]
+            rows[i] = {k: v for k, v in item.items() if k in fields} if fields else item
+    return rows
+
+
+def column_values(cols: Dict[str, Any], field: str, positions: Sequence[int]) -> List[Any]:
+    """`field` of the rows at `positions` as plain Python values (missing numbers back to None)."""
+    col = cols[field][positions]
+    if field == "stock":
+        missing = col == MISSING_STOCK
+    elif field in FLOAT_SORT_FIELDS:
+        missing = np.isnan(col)
+    else:
+        return col.tolist()
+    values = col.tolist()
+    if missing.any():
+        for i in np.flatnonzero(missing).tolist():
+            values[i] = None
+    return values
+
+
+@lru_cache(maxsize=128)
+def _projector(fields: Tuple[str, ...]):
+    """
+    Compile a row builder for one field list, e.g. ("name", "price") ->
+    lambda v0, v1: {"name": v0, "price": v1}, fed one value per field by rows_to_dicts.
+    """
+    params = ", ".join(f"v{i}" for i in range(len(fields)))
+    literal = ", ".join(f"{f!r}: v{i}" for i, f in enumerate(fields))
+    src = f"def build({params}):\n    return {{{literal}}}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(src, f"<projector {','.join(fields)}>", "exec"), namespace)
+    return namespace["build"]
+
+
+def _always_none(it: Dict[str, Any]) -> None:
+    return None
 
 
 def multi_field_sort_key(fields: List[Tuple[str, bool]]):
     """
-    Build a key function for multi-field sorting.
+    Build a key function for multi-field sorting of rows_to_dicts() rows, which carry every
+    ITEM_FIELDS field they were built with plus created_ts and id (see SORT_KEY_COLUMNS).
+    created_at orders by its created_ts timestamp.
     fields: list of (field_name, ascending)
     """
+    # Bound once per sort rather than looked up per row and field
+    parts = [
+        # None-safe sorting: None goes last in both directions
+        (SORT_KEY_COLUMNS.get(fname) or _always_none, asc, float("inf") if asc else float("-inf"))
+        for fname, asc in fields
+    ]
+    get_created_ts, get_id = itemgetter("created_ts"), itemgetter("id")
+
     def key_fn(it: Dict[str, Any]):
         key_parts = []
-        for fname, asc in fields:
-            val = it.get(fname)
+        for get, asc, none_sentinel in parts:
+            val = get(it)
             # Normalize strings for case-insensitive ordering
             if isinstance(val, str):
                 val = val.lower()
-            # None-safe sorting: None goes last in ascending, first in descending
-            none_sentinel = (float("inf") if asc else float("-inf"))
             if val is None:
                 val = none_sentinel
-            key_parts.append(val if asc else _negate_if_number(val))
+            key_parts.append(val if asc else _descending(val))
         # As a final stable tiebreaker, use created_at then id
-        key_parts.append(it.get("created_at", ""))
-        key_parts.append(it.get("id", ""))
+        key_parts.append(get_created_ts(it))
+        key_parts.append(_tiebreak_text(get_id(it)))
         return tuple(key_parts)
     return key_fn
 
 
-def _negate_if_number(x: Any) -> Any:
-    return -x if isinstance(x, (int, float)) else x
+def _created_at_value(it: Dict[str, Any]) -> Optional[int]:
+    ts = it["created_ts"]
+    return None if ts == MISSING_TS else ts
+
+
+def _descending(x: Any) -> Any:
+    return -x if isinstance(x, (int, float)) else _Reversed(x)
+
+
+class _Reversed:
+    """Sort key wrapper inverting the order of a value that can't be negated (strings, lists...)."""
+    __slots__ = ("val",)
+
+    def __init__(self, val: Any):
+        self.val = val
+
+    def __eq__(self, other: "_Reversed") -> bool:
+        return self.val == other.val
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return other.val < self.val
+
+
+# ----------------------------
+# Column store
+# ----------------------------
+def _numeric_or_nan(v: Any) -> float:
+    return float(v) if isinstance(v, (int, float)) else float("nan")
+
+
+def _stock_number(v: Any) -> Optional[int]:
+    """
+    `v` as an exact integer stock count (floats truncated, numeric strings parsed), or None
+    when it isn't a finite number within +-STOCK_LIMIT.
+    """
+    if isinstance(v, str):
+        try:
+            v = int(v)
+        except ValueError:
+            v = coerce_number(v)
+    if isinstance(v, float):
+        if not math.isfinite(v):
+            return None
+        v = int(v)
+    if not isinstance(v, int):
+        return None
+    return int(v) if -STOCK_LIMIT < v < STOCK_LIMIT else None
+
+
+def _stock_or_missing(v: Any) -> int:
+    stock = _stock_number(v) if isinstance(v, (int, float)) else None
+    return MISSING_STOCK if stock is None else stock
 
 
-def apply_filters(data: List[Dict[str, Any]], args) -> List[Dict[str, Any]]:
+def _fits_columns(item: Dict[str, Any]) -> bool:
+    """
+    Whether rows_to_dicts rebuilds `item` as it is: exactly the ITEM_FIELD_ORDER keys, price and
+    rating floats (or None), stock an int in range (or None). Object columns keep values as is.
     """
+    if len(item) != len(ITEM_FIELD_ORDER) or not ITEM_FIELDS.issuperset(item):
+        return False
+    stock = item["stock"]
+    return all(item[f] is None or type(item[f]) is float for f in FLOAT_SORT_FIELDS) and (
+        stock is None or (type(stock) is int and -STOCK_LIMIT < stock < STOCK_LIMIT)
+    )
+
+
+def _field_column(field: str, values: Iterable[Any], n: int) -> np.ndarray:
+    """The store column of one ITEM_FIELD_ORDER field, from its `n` raw values."""
+    if field in FLOAT_SORT_FIELDS:
+        return np.fromiter((_numeric_or_nan(v) for v in values), dtype=np.float64, count=n)
+    if field == "stock":
+        return np.fromiter((_stock_or_missing(v) for v in values), dtype=np.int64, count=n)
+    return _object_column(values, n)
+
+
+def _object_column(values: Iterable[Any], n: int) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=n)
+
+
+def _str_tags(item: Dict[str, Any]) -> List[str]:
+    return list(dict.fromkeys(t for t in item.get("tags") or [] if isinstance(t, str)))
+
+
+WORD_MASK = (1 << 64) - 1
+
+
+def _tag_bitmask(vocab: Dict[str, int], tags: Iterable[str]) -> int:
+    """Python-int bitset with bit vocab[tag] set for each tag (every tag must be in vocab)."""
+    mask = 0
+    for tag in tags:
+        mask |= 1 << vocab[tag]
+    return mask
+
+
+def _tag_words(masks: Sequence[int], n_tags: int) -> np.ndarray:
+    """Split Python-int bitsets into a (len(masks), words) uint64 matrix, word w holding bits 64w..64w+63."""
+    words = max(1, -(-n_tags // 64))
+    out = np.empty((len(masks), words), dtype=np.uint64)
+    for w in range(words):
+        out[:, w] = np.fromiter(((m >> (64 * w)) & WORD_MASK for m in masks), dtype=np.uint64, count=len(masks))
+    return out
+
+
+def _has_tags(tag_bits: np.ndarray, required: np.ndarray) -> np.ndarray:
+    """Bool mask of the rows whose bitset has every bit of `required` (one _tag_words() row) set."""
+    mask = None
+    for w in np.flatnonzero(required).tolist():
+        word = required[w]
+        hit = (tag_bits[:, w] & word) == word
+        mask = hit if mask is None else mask & hit
+    return mask
+
+
+# Sortable from columns (see lexsort_positions); other fields go through multi_field_sort_key.
+# The float ones are the float64 columns (NaN for a missing / non-numeric value), stock is an
+# int64 column (MISSING_STOCK for one), created_at sorts by the created_ts timestamp column.
+FLOAT_SORT_FIELDS = ("price", "rating")
+TEXT_SORT_FIELDS = ("name", "category", "vendor", "id")
+COLUMN_SORT_FIELDS = FLOAT_SORT_FIELDS + ("stock",) + TEXT_SORT_FIELDS + ("created_at",)
+TIEBREAK_FIELDS = ("id",)  # ties go to created_ts first, then these, by raw value
+MISSING_RANK = 2 ** 62  # rank of a missing / non-text value: after every real rank
+MISSING_TS = -MISSING_RANK  # created_ts of a missing / unparseable created_at: before every real one
+STOCK_LIMIT = 2 ** 62  # stock must stay strictly within +-STOCK_LIMIT, so it (and -stock) fits int64
+MISSING_STOCK = MISSING_RANK  # stock of a missing / non-numeric value: sorts like a missing rank
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# What multi_field_sort_key reads for each sortable field from the rows it is given
+SORT_KEY_COLUMNS = {f: itemgetter(f) for f in ITEM_FIELDS}
+SORT_KEY_COLUMNS["created_at"] = _created_at_value
+
+
+def _epoch_us(v: Any) -> int:
+    """An ISO-8601 created_at as integer epoch microseconds (naive = UTC), MISSING_TS if it isn't one."""
+    if not isinstance(v, str):
+        return MISSING_TS
+    try:
+        dt = datetime.fromisoformat(v[:-1] + "+00:00" if v.endswith("Z") else v)
+    except ValueError:
+        return MISSING_TS
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def _sort_text(v: Any) -> Optional[str]:
+    """Text sort value as multi_field_sort_key compares it: lowercased, None when not a string."""
+    return v.lower() if isinstance(v, str) else None
+
+
+def _tiebreak_text(v: Any) -> str:
+    return v if isinstance(v, str) else ""
+
+
+def _rank_column(values: List[Optional[str]]) -> Tuple[List[str], np.ndarray]:
+    """Dense int64 ranks of `values` (None -> MISSING_RANK), plus the sorted distinct values they index."""
+    distinct = sorted({v for v in values if v is not None})
+    lookup = {v: r for r, v in enumerate(distinct)}
+    ranks = np.fromiter(
+        (MISSING_RANK if v is None else lookup[v] for v in values), dtype=np.int64, count=len(values)
+    )
+    return distinct, ranks
+
+
+def _rank_append(column: Tuple[List[str], np.ndarray], value: Optional[str]) -> Tuple[List[str], np.ndarray]:
+    """Copy-on-write append of one value to a _rank_column() result."""
+    distinct, ranks = column
+    if value is None:
+        return distinct, np.append(ranks, MISSING_RANK)
+    at = bisect_left(distinct, value)
+    if at < len(distinct) and distinct[at] == value:
+        return distinct, np.append(ranks, at)
+    # A new distinct value: everything ranked at or after it moves up one
+    shifted = ranks + ((ranks >= at) & (ranks != MISSING_RANK))
+    return distinct[:at] + [value] + distinct[at:], np.append(shifted, at)
+
+
+# Separators for the "q" search blob: fields of one item, and items
+SEARCH_FIELD_SEP = "\x1f"
+SEARCH_ITEM_SEP = "\x1e"
+
+
+def _search_text(item: Dict[str, Any]) -> str:
+    """The lowercased fields "q" searches (name, vendor, category, each tag), joined by SEARCH_FIELD_SEP."""
+    parts = [item.get(f, "") for f in ("name", "vendor", "category")]
+    parts = [v.lower() if isinstance(v, str) else "" for v in parts]
+    parts.extend(str(tag).lower() for tag in item.get("tags") or [])
+    return SEARCH_FIELD_SEP.join(parts)
+
+
+def build_columns(items: Sequence[Dict[str, Any]], version: int = 0) -> Dict[str, Any]:
+    """
+    Build the column store from `items` (the loaded / generated rows; only the ones in raw_rows
+    are kept afterwards). Row i of the store is items[i]; a field an item lacks is stored as
+    missing (None / NaN).
+      - one column per ITEM_FIELD_ORDER field (_field_column): price, rating are float64
+        (NaN for a missing / non-numeric value), stock is int64 (MISSING_STOCK for a missing,
+        non-numeric or out-of-range value), the rest object columns
+      - version: the STORE_VERSION the store was built for (part of every cache key)
+      - id_pos: id -> position, of the first row carrying that id (string ids only: lookups
+        come from URL paths, and a hand-edited data.json may hold anything)
+      - created_ts: int64 epoch microseconds of created_at (_epoch_us), for sorting by time
+      - ranks: field -> _rank_column() of the lowercased TEXT_SORT_FIELDS values
+      - tiebreak_ranks: field -> _rank_column() of the raw TIEBREAK_FIELDS values
+      - tag_vocab: tag -> bit number, in order of first appearance
+      - tag_bits: uint64 bitset matrix (_tag_words), bit tag_vocab[tag] set when the row carries the tag
+      - search_blob: every row's _search_text() joined by SEARCH_ITEM_SEP,
+        search_starts: offset in the blob where each row's text starts
+      - order: sort spec -> all positions, pre-sorted by lexsort_positions
+      - raw_rows: position -> item as loaded, for the rows the columns can't reproduce
+        (_fits_columns: extra keys, absent fields, numbers of another type); item_dicts
+        returns and saves these unchanged, the columns only serve filtering and sorting
+    """
+    n = len(items)
+    tag_vocab: Dict[str, int] = {}
+    row_tags = [_str_tags(item) for item in items]
+    for tags in row_tags:
+        for tag in tags:
+            tag_vocab.setdefault(tag, len(tag_vocab))
+    tag_bits = _tag_words([_tag_bitmask(tag_vocab, tags) for tags in row_tags], len(tag_vocab))
+    texts = [_search_text(x) for x in items]
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(SEARCH_ITEM_SEP)
+    id_pos: Dict[str, int] = {}
+    for pos, item in enumerate(items):
+        if isinstance(item.get("id"), str):
+            id_pos.setdefault(item["id"], pos)  # first one wins, as a linear scan would find
+
+    cols: Dict[str, Any] = {f: _field_column(f, (x.get(f) for x in items), n) for f in ITEM_FIELD_ORDER}
+    cols.update({
+        "version": version,
+        "id_pos": id_pos,
+        "created_ts": np.fromiter((_epoch_us(x.get("created_at")) for x in items), dtype=np.int64, count=n),
+        "ranks": {f: _rank_column([_sort_text(x.get(f)) for x in items]) for f in TEXT_SORT_FIELDS},
+        "tiebreak_ranks": {f: _rank_column([_tiebreak_text(x.get(f, "")) for x in items]) for f in TIEBREAK_FIELDS},
+        "tag_vocab": tag_vocab,
+        "tag_bits": tag_bits,
+        "search_blob": SEARCH_ITEM_SEP.join(texts),
+        "search_starts": starts,
+        "raw_rows": {pos: item for pos, item in enumerate(items) if not _fits_columns(item)},
+    })
+    cols["order"] = {spec: lexsort_positions(cols, np.arange(n), list(spec)) for spec in INDEXED_SORTS}
+    return cols
+
+
+def append_row(cols: Dict[str, Any], item: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """
+    Return a copy of the store `cols` with `item` appended as its last row, stamped with the
+    new store `version` (copy-on-write: every array is re-allocated, `cols` is left as is).
+    """
+    pos = len(cols["id"])
+    item_tags = _str_tags(item)
+    tag_vocab = dict(cols["tag_vocab"])
+    for tag in item_tags:
+        tag_vocab.setdefault(tag, len(tag_vocab))
+    row_bits = _tag_words([_tag_bitmask(tag_vocab, item_tags)], len(tag_vocab))
+    old_bits = cols["tag_bits"]
+    tag_bits = np.zeros((pos + 1, row_bits.shape[1]), dtype=np.uint64)
+    tag_bits[:pos, :old_bits.shape[1]] = old_bits
+    tag_bits[pos] = row_bits[0]
+    blob = cols["search_blob"]
+    if pos:
+        blob += SEARCH_ITEM_SEP
+    id_pos = dict(cols["id_pos"])
+    if isinstance(item.get("id"), str):
+        id_pos.setdefault(item["id"], pos)
+
+    new: Dict[str, Any] = {f: np.append(cols[f], _field_column(f, [item.get(f)], 1)) for f in ITEM_FIELD_ORDER}
+    new.update({
+        "version": version,
+        "id_pos": id_pos,
+        "created_ts": np.append(cols["created_ts"], _epoch_us(item.get("created_at"))),
+        "ranks": {f: _rank_append(col, _sort_text(item.get(f))) for f, col in cols["ranks"].items()},
+        "tiebreak_ranks": {
+            f: _rank_append(col, _tiebreak_text(item.get(f, ""))) for f, col in cols["tiebreak_ranks"].items()
+        },
+        "tag_vocab": tag_vocab,
+        "tag_bits": tag_bits,
+        "search_blob": blob + _search_text(item),
+        "search_starts": cols["search_starts"] + [len(blob)],
+        "raw_rows": cols["raw_rows"] if _fits_columns(item) else {**cols["raw_rows"], pos: item},
+    })
+    new["order"] = {spec: _insert_sorted(new, order, pos, list(spec)) for spec, order in cols["order"].items()}
+    return new
+
+
+def _insert_sorted(cols: Dict[str, Any], order: np.ndarray, pos: int, fields: List[Tuple[str, bool]]) -> np.ndarray:
+    """
+    Insert `pos` into `order` (positions already sorted by `fields`, as lexsort_positions leaves
+    them) where a full re-sort would put it: each sort key narrows the run of rows tied with
+    `pos` by binary search, and `pos` goes after all its ties (lexsort is stable). O(n), vs a
+    re-sort's O(n log n); rank shifts from _rank_append keep the old rows' relative order.
+    """
+    keys = _sort_keys(cols, order, fields)
+    values = _sort_keys(cols, np.array([pos], dtype=np.intp), fields)
+    lo, hi = 0, len(order)
+    for key, value in zip(keys, values):
+        run = key[lo:hi]
+        lo, hi = lo + int(np.searchsorted(run, value[0], "left")), lo + int(np.searchsorted(run, value[0], "right"))
+        if lo == hi:
+            break
+    return np.insert(order, hi, pos)
+
+
+def lexsort_positions(cols: Dict[str, Any], positions: np.ndarray, fields: List[Tuple[str, bool]]) -> np.ndarray:
+    """
+    Sort `positions` by `fields` entirely on the columns with one np.lexsort; same order as
+    multi_field_sort_key (text compared lowercased, created_at by time, missing values last in
+    both directions, ties broken by created_at then id). Every field must be in COLUMN_SORT_FIELDS.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    keys = _sort_keys(cols, positions, fields)
+    # lexsort treats its last key as the primary one
+    return positions[np.lexsort(keys[::-1])]
+
+
+def partial_lexsort_positions(
+    cols: Dict[str, Any], positions: np.ndarray, fields: List[Tuple[str, bool]], need: int
+) -> np.ndarray:
+    """
+    Like lexsort_positions, but only the first `need` (>= 1) positions are guaranteed to be in
+    order; the rest follow unsorted. An O(n) partition on the primary key finds the cutoff
+    value of the first `need`, and only the rows up to that cutoff get lexsorted.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    keys = _sort_keys(cols, positions, fields)
+    primary = keys[0]
+    cutoff = np.partition(primary, need - 1)[need - 1]
+    if cutoff != cutoff:  # NaN: rows without a value reach into the prefix, sort everything
+        return positions[np.lexsort(keys[::-1])]
+    in_head = primary <= cutoff
+    head = np.flatnonzero(in_head)
+    head = head[np.lexsort([k[head] for k in keys[::-1]])]
+    return positions[np.concatenate([head, np.flatnonzero(~in_head)])]
+
+
+def _sort_keys(cols: Dict[str, Any], positions: np.ndarray, fields: List[Tuple[str, bool]]) -> List[np.ndarray]:
+    """Sort key columns of `positions` for `fields`, primary key first, tiebreakers last."""
+    keys = []
+    for fname, asc in fields:
+        if fname in FLOAT_SORT_FIELDS:
+            col = cols[fname][positions]
+            keys.append(col if asc else -col)  # NaN (missing) sorts last either way
+        elif fname == "created_at":
+            ts = cols["created_ts"][positions]
+            keys.append(np.where(ts == MISSING_TS, MISSING_RANK, ts if asc else -ts))
+        else:
+            # Stock counts and text ranks alike: int64, MISSING_RANK (last either way) when missing
+            ranks = cols["stock"][positions] if fname == "stock" else cols["ranks"][fname][1][positions]
+            keys.append(ranks if asc else np.where(ranks == MISSING_RANK, MISSING_RANK, -ranks))
+    keys.append(cols["created_ts"][positions])
+    keys.append(cols["tiebreak_ranks"]["id"][1][positions])
+    return keys
+
+
+def _numeric_mask_loop(price, rating, bounds, active, out):
+    """
+    out[i] = whether row i passes the active bounds, in one fused pass.
+    bounds: (min_price, max_price, min_rating, max_rating); active[k] says whether bounds[k] applies.
+    """
+    for i in range(price.size):
+        p = price[i]
+        r = rating[i]
+        out[i] = (
+            (not active[0] or p >= bounds[0])
+            and (not active[1] or p <= bounds[1])
+            and (not active[2] or r >= bounds[2])
+            and (not active[3] or r <= bounds[3])
+        )
+
+
+def _numeric_mask_numpy(price, rating, bounds, active, out):
+    """Same contract as _numeric_mask_loop, as NumPy expressions (used when numba is missing)."""
+    out[:] = True
+    if active[0]:
+        out &= price >= bounds[0]
+    if active[1]:
+        out &= price <= bounds[1]
+    if active[2]:
+        out &= rating >= bounds[2]
+    if active[3]:
+        out &= rating <= bounds[3]
+
+
+def _stats_sums_loop(price, rating, positions):
+    """
+    (price sum, price count, rating sum, rating count) over the rows at `positions`, in one
+    pass and in `positions` order; NaN (missing / non-numeric) values are skipped.
+    """
+    price_sum = 0.0
+    rating_sum = 0.0
+    price_n = 0
+    rating_n = 0
+    for k in range(positions.size):
+        p = price[positions[k]]
+        r = rating[positions[k]]
+        if p == p:
+            price_sum += p
+            price_n += 1
+        if r == r:
+            rating_sum += r
+            rating_n += 1
+    return price_sum, price_n, rating_sum, rating_n
+
+
+def _stats_sums_numpy(price, rating, positions):
+    """Same contract as _stats_sums_loop, as NumPy reductions (used when numba is missing)."""
+    p = price[positions]
+    r = rating[positions]
+    return float(np.nansum(p)), int(np.count_nonzero(p == p)), float(np.nansum(r)), int(np.count_nonzero(r == r))
+
+
+if njit is not None:
+    # nogil lets concurrent request threads run the kernels side by side. Not parallel=True:
+    # the default workqueue threading layer isn't safe to enter from several threads at once.
+    # Not fastmath either: it assumes no NaNs, and NaN marks non-numeric values in the columns.
+    numeric_mask = njit(cache=True, nogil=True, boundscheck=False)(_numeric_mask_loop)
+    stats_sums = njit(cache=True, nogil=True, boundscheck=False)(_stats_sums_loop)
+else:
+    numeric_mask = _numeric_mask_numpy
+    stats_sums = _stats_sums_numpy
+
+
+def warm_kernels() -> None:
+    """Compile (or load from cache) the numba kernels before the first request needs them."""
+    numeric_mask(np.zeros(1), np.zeros(1), np.zeros(4), np.ones(4, dtype=np.bool_), np.empty(1, dtype=np.bool_))
+    positions = np.zeros(1, dtype=np.intp)
+    stats_sums(np.zeros(1), np.zeros(1), positions)
+    # Cached query results are read-only arrays, a separate specialization
+    stats_sums(np.zeros(1), np.zeros(1), _frozen(positions))
+
+
+class FilterSpec(NamedTuple):
+    """Parsed filter query params; hashable, so it doubles as a cache key."""
+    category: Optional[str]
+    vendor: Optional[str]
+    min_price: Optional[float]
+    max_price: Optional[float]
+    min_rating: Optional[float]
+    max_rating: Optional[float]
+    tags: FrozenSet[str]
+    q: Optional[str]
+
+
+def parse_filters(args_get, args_getlist) -> FilterSpec:
+    """
+    args_get / args_getlist: query string lookups, e.g. request.args.get / request.args.getlist
     Supported filters:
       - category
       - min_price, max_price
@@ -160,85 +762,247 @@ def apply_filters(data: List[Dict[str, Any]], args) -> List[Dict[str, Any]]:
       - min_rating, max_rating
       - vendor
     """
-    out = data
-    category = args.get("category")
-    vendor = args.get("vendor")
-    min_price = coerce_number(args.get("min_price"))
-    max_price = coerce_number(args.get("max_price"))
-    min_rating = coerce_number(args.get("min_rating"))
-    max_rating = coerce_number(args.get("max_rating"))
-    tags = args.getlist("tag") if hasattr(args, "getlist") else args.get("tag", [])
-    if isinstance(tags, str):
-        tags = [tags]
-    q = args.get("q")
-
-    if category:
-        out = [x for x in out if x.get("category") == category]
-    if vendor:
-        out = [x for x in out if x.get("vendor") == vendor]
-    if min_price is not None:
-        out = [x for x in out if isinstance(x.get("price"), (int, float)) and x["price"] >= min_price]
-    if max_price is not None:
-        out = [x for x in out if isinstance(x.get("price"), (int, float)) and x["price"] <= max_price]
-    if min_rating is not None:
-        out = [x for x in out if isinstance(x.get("rating"), (int, float)) and x["rating"] >= min_rating]
-    if max_rating is not None:
-        out = [x for x in out if isinstance(x.get("rating"), (int, float)) and x["rating"] <= max_rating]
-    if tags:
-        tset = set(tags)
-        out = [x for x in out if tset.issubset(set(x.get("tags", [])))]
-    if q:
-        ql = q.lower()
-        out = [
-            x for x in out
-            if ql in x.get("name", "").lower()
-            or ql in x.get("vendor", "").lower()
-            or ql in x.get("category", "").lower()
-            or any(ql in str(tag).lower() for tag in x.get("tags", []))
+    return FilterSpec(
+        category=args_get("category") or None,
+        vendor=args_get("vendor") or None,
+        min_price=coerce_number(args_get("min_price")),
+        max_price=coerce_number(args_get("max_price")),
+        min_rating=coerce_number(args_get("min_rating")),
+        max_rating=coerce_number(args_get("max_rating")),
+        tags=frozenset(args_getlist("tag")),
+        q=args_get("q") or None,
+    )
+
+
+def apply_filters(cols: Dict[str, Any], filters: FilterSpec) -> np.ndarray:
+    """
+    Apply parse_filters() output to the store `cols`.
+    Returns the (ascending) positions of the matching rows, as an index array.
+    """
+    signature = tuple(bool(v) if isinstance(v, frozenset) else v is not None for v in filters)
+    return _filter_function(signature)(cols, filters)
+
+
+@lru_cache(maxsize=256)
+def _filter_function(signature: Tuple[bool, ...]):
+    """
+    Compile the filter for one combination of active FilterSpec fields (`signature`), e.g.
+    category + max_price becomes a straight-line function that runs numeric_mask and the
+    category compare on the columns and nothing else: no per-request branching over inactive
+    filters, and no all-True seed mask when some predicate can produce the first mask.
+    """
+    active = dict(zip(FilterSpec._fields, signature))
+    bounds = ("min_price", "max_price", "min_rating", "max_rating")
+    prelude, lines = [], []
+
+    def narrow(expr: str) -> None:
+        lines.append(f"    mask &= {expr}" if lines else f"    mask = {expr}")
+
+    if any(active[b] for b in bounds):
+        bound_values = ", ".join(f"f.{b}" if active[b] else "0.0" for b in bounds)
+        lines.append("    mask = np.empty(len(cols['id']), dtype=np.bool_)")
+        lines.append(f"    numeric_mask(cols['price'], cols['rating'], np.array([{bound_values}]), ACTIVE, mask)")
+    for fname in ("category", "vendor"):
+        if active[fname]:
+            narrow(f"cols[{fname!r}] == f.{fname}")
+    if active["tags"]:
+        # All the required tags are tested at once, as one AND + compare per bitset word
+        prelude += [
+            "    vocab = cols['tag_vocab']",
+            "    if not all(tag in vocab for tag in f.tags):",
+            "        return np.empty(0, dtype=np.intp)",
+            "    required = _tag_words([_tag_bitmask(vocab, f.tags)], len(vocab))[0]",
         ]
-    return out
+        narrow("_has_tags(cols['tag_bits'], required)")
+    if active["q"]:
+        narrow("_search_mask(cols, f.q.lower())")
+    lines.append("    return np.flatnonzero(mask)" if lines else "    return np.arange(len(cols['id']))")
+
+    src = "def filter_positions(cols, f):\n" + "\n".join(prelude + lines) + "\n"
+    namespace: Dict[str, Any] = {
+        "np": np,
+        "numeric_mask": numeric_mask,
+        "_search_mask": _search_mask,
+        "_tag_bitmask": _tag_bitmask,
+        "_tag_words": _tag_words,
+        "_has_tags": _has_tags,
+        "ACTIVE": np.array([active[b] for b in bounds], dtype=np.bool_),
+    }
+    name = ",".join(f for f, on in active.items() if on) or "none"
+    exec(compile(src, f"<filter {name}>", "exec"), namespace)
+    return namespace["filter_positions"]
 
 
-def apply_sort(data: List[Dict[str, Any]], sort_by: Optional[str]) -> List[Dict[str, Any]]:
+def _search_mask(cols: Dict[str, Any], ql: str) -> np.ndarray:
+    """
+    Bool mask of the rows matching the "q" substring search. Scans the pre-lowercased search
+    blob once and maps each hit back to its row, instead of lowercasing every field per row.
+    Hits are remembered per store version; a longer query whose prefix was searched recently
+    only re-checks that prefix's hits (every match of "omeg" is also a match of "ome").
+    """
+    if SEARCH_FIELD_SEP in ql or SEARCH_ITEM_SEP in ql:
+        # A hit could straddle two fields; check row by row
+        rows = rows_to_dicts(cols, np.arange(len(cols["id"])), ("name", "vendor", "category", "tags"))
+        return np.fromiter((_matches_query(x, ql) for x in rows), dtype=np.bool_, count=len(rows))
+    blob, starts = cols["search_blob"], cols["search_starts"]
+    n = len(starts)
+    version = cols["version"]
+    hits = np.zeros(n, dtype=np.bool_)
+    cached = _cache_get(SEARCH_CACHE, (version, ql))
+    if cached is not None:
+        hits[cached] = True
+        return hits
+
+    prior = None
+    for k in range(len(ql) - 1, 0, -1):
+        prior = _cache_get(SEARCH_CACHE, (version, ql[:k]))
+        if prior is not None:
+            break
+    # Re-checking candidates costs a Python step each, a full scan only one per hit,
+    # so the prefix's hits are only worth it while they're a small part of the store.
+    if prior is not None and len(prior) * 8 < n:
+        for pos in prior.tolist():
+            end = starts[pos + 1] if pos + 1 < n else len(blob)
+            if blob.find(ql, starts[pos], end) != -1:
+                hits[pos] = True
+    else:
+        at = blob.find(ql)
+        while at != -1:
+            pos = bisect_right(starts, at) - 1
+            hits[pos] = True
+            if pos + 1 == n:
+                break
+            # One hit per item is enough: resume at the next item's text
+            at = blob.find(ql, starts[pos + 1])
+    _cache_put(SEARCH_CACHE, (version, ql), _frozen(np.flatnonzero(hits)), SEARCH_CACHE_SIZE)
+    return hits
+
+
+def _matches_query(x: Dict[str, Any], ql: str) -> bool:
+    return (
+        ql in (x["name"] or "").lower()
+        or ql in (x["vendor"] or "").lower()
+        or ql in (x["category"] or "").lower()
+        or any(ql in str(tag).lower() for tag in x["tags"] or [])
+    )
+
+
+def parse_sort_param(sort_by: Optional[str]) -> List[Tuple[str, bool]]:
+    """'price,-rating' -> [("price", True), ("rating", False)]; DEFAULT_SORT when empty."""
+    if not sort_by:
+        return DEFAULT_SORT
+    fields = []
+    for raw in sort_by.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        asc = True
+        if raw.startswith("-"):
+            asc = False
+            raw = raw[1:]
+        fields.append((raw, asc))
+    return fields
+
+
+PARTIAL_SORT_FRACTION = 4  # partial-sort only when the needed prefix is under 1/4 of the rows
+
+
+def partial_sort_need(need: Optional[int], n: int) -> Optional[int]:
+    """`need` when sorting just a prefix of that many out of `n` rows pays off, else None (sort all)."""
+    if need is not None and 0 < need and need * PARTIAL_SORT_FRACTION < n:
+        return need
+    return None
+
+
+def apply_sort(
+    cols: Dict[str, Any],
+    sort_by: Optional[str],
+    positions: Optional[Sequence[int]] = None,
+    need: Optional[int] = None,
+) -> np.ndarray:
     """
     sort_by: comma-separated fields, prefix with '-' for descending
              e.g., 'price,-rating,name'
+    positions: which rows of the store `cols` to sort (default: all of them)
+    need: when set (see partial_sort_need), only the first `need` positions are guaranteed
+          to be in order, the rest follow unsorted
+    Pre-sorted orders are reused when available.
+    Returns the positions in sorted order.
     """
-    if not sort_by:
-        # default sort: -created_at (newest first), then name
-        fields = [("created_at", False), ("name", True)]
-    else:
-        fields = []
-        for raw in sort_by.split(","):
-            raw = raw.strip()
-            if not raw:
-                continue
-            asc = True
-            if raw.startswith("-"):
-                asc = False
-                raw = raw[1:]
-            fields.append((raw, asc))
+    if positions is None:
+        positions = np.arange(len(cols["id"]))
+    positions = np.asarray(positions, dtype=np.intp)
+    fields = parse_sort_param(sort_by)
+    order = cols["order"].get(tuple(fields))
+    # Masking a pre-sorted order is O(N); for very selective filters sorting the survivors is cheaper
+    if order is not None and len(positions) * 64 >= len(order):
+        if len(positions) == len(order):
+            return order
+        member = np.zeros(len(order), dtype=np.bool_)
+        member[positions] = True
+        return order[member[order]]
+    need = partial_sort_need(need, len(positions))
+    if all(f in COLUMN_SORT_FIELDS for f, _ in fields):
+        if need is not None:
+            return partial_lexsort_positions(cols, positions, fields, need)
+        return lexsort_positions(cols, positions, fields)
+    # Some field (tags, attributes, unknown) isn't orderable on the columns: build just the
+    # fields the key looks at and sort those rows in Python
     key_fn = multi_field_sort_key(fields)
-    return sorted(data, key=key_fn)
+    key_fields = [f for f, _ in fields if f in ITEM_FIELDS and f != "created_at"] + ["created_ts", "id"]
+    rows = rows_to_dicts(cols, positions, key_fields)
+    if need is not None:
+        head = heapq.nsmallest(need, range(len(rows)), key=lambda i: key_fn(rows[i]))
+        rest = np.ones(len(rows), dtype=np.bool_)
+        rest[head] = False
+        return positions[np.concatenate([np.array(head, dtype=np.intp), np.flatnonzero(rest)])]
+    return positions[sorted(range(len(rows)), key=lambda i: key_fn(rows[i]))]
+
 
+PAGE_INDEX_LIMIT = 2 ** 53 - 1  # largest offset / page: past any row count, exact in every JSON client
 
-def apply_pagination(data: List[Dict[str, Any]], args) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+
+def parse_page_params(args_get) -> Tuple[str, int, int]:
     """
-    Supports page/page_size (1-based) and offset/limit (0-based).
+    ("offset", offset, limit) or ("page", page, page_size), clamped to the allowed ranges.
     If offset/limit present, they take precedence.
     """
-    total = len(data)
     # Offset/limit style
-    limit = args.get("limit")
-    offset = args.get("offset")
+    limit = args_get("limit")
+    offset = args_get("offset")
     if limit is not None or offset is not None:
         try:
             lim = int(limit) if limit is not None else 50
             off = int(offset) if offset is not None else 0
         except ValueError:
             lim, off = 50, 0
-        lim = max(0, min(lim, 500))
-        off = max(0, off)
+        return "offset", max(0, min(off, PAGE_INDEX_LIMIT)), max(0, min(lim, 500))
+
+    # Page/page_size style
+    try:
+        page = int(args_get("page", 1))
+        page_size = int(args_get("page_size", 50))
+    except ValueError:
+        page, page_size = 1, 50
+    return "page", max(1, min(page, PAGE_INDEX_LIMIT)), max(1, min(page_size, 500))
+
+
+def page_end(args_get) -> int:
+    """How many leading rows of the sorted result the requested page reaches into."""
+    mode, a, b = parse_page_params(args_get)
+    return a + b if mode == "offset" else a * b
+
+
+def apply_pagination(data: Sequence[Any], args_get) -> Tuple[Sequence[Any], Dict[str, Any]]:
+    """
+    Supports page/page_size (1-based) and offset/limit (0-based).
+    If offset/limit present, they take precedence.
+    `data` is any sliceable sequence (the list endpoints page over sorted positions).
+    """
+    total = len(data)
+    mode, a, b = parse_page_params(args_get)
+    if mode == "offset":
+        off, lim = a, b
         page_data = data[off: off + lim]
         meta = {
             "mode": "offset",
@@ -250,14 +1014,7 @@ def apply_pagination(data: List[Dict[str, Any]], args) -> Tuple[List[Dict[str, A
         }
         return page_data, meta
 
-    # Page/page_size style
-    try:
-        page = int(args.get("page", 1))
-        page_size = int(args.get("page_size", 50))
-    except ValueError:
-        page, page_size = 1, 50
-    page = max(1, page)
-    page_size = max(1, min(page_size, 500))
+    page, page_size = a, b
     start = (page - 1) * page_size
     end = start + page_size
     page_data = data[start:end]
@@ -275,15 +1032,21 @@ def apply_pagination(data: List[Dict[str, Any]], args) -> Tuple[List[Dict[str, A
     return page_data, meta
 
 
-def compute_stats(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    if not data:
+def compute_stats(cols: Dict[str, Any], positions: Sequence[int]) -> Dict[str, Any]:
+    """
+    Average price / rating over the rows at `positions`. Floats are summed in row order, not in
+    `positions` order: a partially sorted result leaves its tail in arbitrary order, and the
+    same row set must give the same averages whatever page or cached prefix produced it.
+    """
+    if not len(positions):
         return {"avg_price": None, "avg_rating": None, "count": 0}
-    prices = [d["price"] for d in data if isinstance(d.get("price"), (int, float))]
-    ratings = [d["rating"] for d in data if isinstance(d.get("rating"), (int, float))]
+    member = np.zeros(len(cols["id"]), dtype=np.bool_)
+    member[np.asarray(positions, dtype=np.intp)] = True
+    price_sum, price_n, rating_sum, rating_n = stats_sums(cols["price"], cols["rating"], np.flatnonzero(member))
     return {
-        "avg_price": round(sum(prices) / len(prices), 2) if prices else None,
-        "avg_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
-        "count": len(data),
+        "avg_price": round(price_sum / price_n, 2) if price_n else None,
+        "avg_rating": round(rating_sum / rating_n, 2) if rating_n else None,
+        "count": len(positions),
     }
 
 
@@ -296,11 +1059,85 @@ def parse_fields_param(raw: Optional[str]) -> Optional[List[str]]:
 
 
 # ----------------------------
-# Error helpers
+# Query cache
+# ----------------------------
+def _cache_get(cache: "OrderedDict[tuple, Any]", key: tuple) -> Any:
+    with CACHE_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: "OrderedDict[tuple, Any]", key: tuple, value: Any, maxsize: int) -> None:
+    with CACHE_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+
+def _frozen(value: np.ndarray) -> np.ndarray:
+    value.flags.writeable = False  # shared between requests from now on
+    return value
+
+
+def query_positions(
+    cols: Dict[str, Any], filters: FilterSpec, sort_by: Optional[str], need: Optional[int] = None
+) -> np.ndarray:
+    """
+    Filtered + sorted positions for a list request; only the first `need` are guaranteed to
+    be in order when set (see apply_sort). Results are memoized by (store version, parsed
+    filters, parsed sort) along with how long their sorted prefix is (None: all of it), so
+    repeated queries skip both steps and a deeper page over the same query only re-sorts.
+    """
+    key = (cols["version"], filters, tuple(parse_sort_param(sort_by)))
+    cached = _cache_get(QUERY_CACHE, key)
+    if cached is not None:
+        positions, sorted_upto = cached
+        if sorted_upto is None or (need is not None and need <= sorted_upto):
+            return positions
+    else:
+        positions = apply_filters(cols, filters)
+    need = partial_sort_need(need, len(positions))
+    positions = apply_sort(cols, sort_by, positions, need)
+    if positions is cols["order"].get(key[2]):
+        positions = positions.copy()  # don't freeze an array the store owns
+    _cache_put(QUERY_CACHE, key, (_frozen(positions), need), QUERY_CACHE_SIZE)
+    return positions
+
+
+# ----------------------------
+# Response helpers
 # ----------------------------
+def ojsonify(obj: Any, status: int = 200):
+    """Like flask.jsonify, but encodes with orjson (straight to bytes)."""
+    body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return make_response(body, status, {"Content-Type": "application/json"})
+
+
+STREAM_CHUNK_ITEMS = 64  # items encoded per chunk written by stream_page
+
+
+def stream_page(page_data: Sequence[Dict[str, Any]], meta_json: bytes) -> Iterable[bytes]:
+    """
+    Encode {"data": page_data, "meta": <meta_json>} incrementally, so the first bytes can go out
+    while later items are still being encoded and the full body never sits in memory.
+    Items are batched into chunks to keep the number of writes to the socket down. `meta_json`
+    comes in already encoded, so nothing about it can fail once the status line is out.
+    """
+    yield b'{"data":['
+    for start in range(0, len(page_data), STREAM_CHUNK_ITEMS):
+        chunk = b",".join(
+            orjson.dumps(x, option=orjson.OPT_NON_STR_KEYS)
+            for x in page_data[start:start + STREAM_CHUNK_ITEMS]
+        )
+        yield chunk if start == 0 else b"," + chunk
+    yield b'],"meta":' + meta_json + b"}"
+
+
 def json_error(status: int, message: str):
-    resp = jsonify({"error": {"status": status, "message": message, "timestamp": now_iso()}})
-    return make_response(resp, status)
+    return ojsonify({"error": {"status": status, "message": message, "timestamp": now_iso()}}, status)
 
 
 # ----------------------------
@@ -322,19 +1159,30 @@ def create_item():
     name = payload.get("name")
     category = payload.get("category")
     price = coerce_number(payload.get("price"))
-    if not name or not category or price is None:
+    if not name or not category or price is None or not math.isfinite(price):
         return json_error(400, "Fields 'name', 'category', and numeric 'price' are required.")
+    # Stored numbers are always finite floats / ints, so the columns never see anything else
+    rating = coerce_number(payload.get("rating") or 0)
+    if rating is None or not math.isfinite(rating):
+        return json_error(400, "Field 'rating' must be numeric when given.")
+    stock = _stock_number(payload.get("stock") or 0)
+    if stock is None:
+        return json_error(400, "Field 'stock' must be numeric, with magnitude below 2**62, when given.")
+
+    item_id = payload.get("id") or str(uuid.uuid4())
+    if not isinstance(item_id, str):
+        return json_error(400, "Field 'id' must be a string.")
 
     # Build the item
     new_item = {
-        "id": payload.get("id") or str(uuid.uuid4()),
+        "id": item_id,
         "name": name,
         "category": category,
-        "price": round(float(price), 2),
-        "rating": round(float(coerce_number(payload.get("rating")) or 0), 2),
+        "price": round(price, 2),
+        "rating": round(rating, 2),
         "tags": payload.get("tags") or [],
         "created_at": now_iso(),
-        "stock": int(payload.get("stock") or 0),
+        "stock": stock,
         "vendor": payload.get("vendor") or generate_vendor(),
         "attributes": payload.get("attributes") or {},
     }
@@ -346,14 +1194,23 @@ def create_item():
             new_item["tags"].append("luxury")
         new_item["rating"] = max(new_item["rating"], 4.0)
 
+    # Everything in the store gets encoded again by responses and saves; refuse what orjson can't
+    # (e.g. integers beyond 64 bits) before it is published, not after
+    try:
+        orjson.dumps(new_item, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json_error(400, "Item contains values that can't be stored as JSON (e.g. integers beyond 64 bits).")
+
+    global SNAPSHOT, STORE_VERSION
     with STORE_LOCK:
         # Reject duplicate id
-        if any(it["id"] == new_item["id"] for it in ITEMS):
+        if new_item["id"] in SNAPSHOT["id_pos"]:
             return json_error(409, "Item with this 'id' already exists.")
-        ITEMS.append(new_item)
-        save_data()
+        STORE_VERSION += 1
+        SNAPSHOT = append_row(SNAPSHOT, new_item, STORE_VERSION)
+    schedule_save()
 
-    resp = make_response(jsonify(new_item), 201)
+    resp = ojsonify(new_item, 201)
     resp.headers["Location"] = url_for("get_item", item_id=new_item["id"], _external=False)
     return resp
 
@@ -365,11 +1222,50 @@ def get_item(item_id: str):
     Optional: ?fields=name,price,rating  (projection)
     """
     fields = parse_fields_param(request.args.get("fields"))
-    with STORE_LOCK:
-        item = next((x for x in ITEMS if x["id"] == item_id), None)
-    if not item:
+    cols = SNAPSHOT
+    pos = cols["id_pos"].get(item_id)
+    if pos is None:
         return json_error(404, "Item not found.")
-    return jsonify(project_fields(item, fields))
+    return ojsonify(item_dicts(cols, [pos], fields)[0])
+
+
+def _list_pipeline(args_get, args_getlist, overrides: Dict[str, Any]) -> Response:
+    """
+    Shared body of the list endpoints: filter, sort, paginate, project and stream a page.
+    args_get / args_getlist: query string lookups, e.g. request.args.get / request.args.getlist
+    overrides: FilterSpec fields fixed by the route's path, e.g. {"category": category};
+               they take precedence over the query string
+    """
+    include_stats = parse_bool(args_get("include_stats"))
+    fields = parse_fields_param(args_get("fields"))
+    sort_by = args_get("sort_by")
+    filters = parse_filters(args_get, args_getlist)
+    if overrides:
+        filters = filters._replace(**overrides)
+
+    cols = SNAPSHOT
+
+    # Filters + sorting
+    positions = query_positions(cols, filters, sort_by, page_end(args_get))
+    total_after_filter = len(positions)
+
+    # Pagination
+    page, meta = apply_pagination(positions, args_get)
+    if include_stats:
+        meta["stats_over_page"] = compute_stats(cols, page)
+        # A page holding the whole filtered set has the same stats; don't compute them twice
+        meta["stats_over_filtered"] = (
+            meta["stats_over_page"] if len(page) == len(positions) else compute_stats(cols, positions)
+        )
+
+    # Projection
+    page_data = item_dicts(cols, page, fields)
+
+    return Response(
+        stream_page(page_data, orjson.dumps(meta, option=orjson.OPT_NON_STR_KEYS)),
+        mimetype="application/json",
+        headers={"X-Total-Count": str(total_after_filter)},
+    )
 
 
 @app.route("/items", methods=["GET"])
@@ -384,34 +1280,7 @@ def list_items():
       - Stats: include_stats=true
     Returns: { data: [...], meta: {...} } and X-Total-Count header
     """
-    args = request.args
-    include_stats = parse_bool(args.get("include_stats"))
-    fields = parse_fields_param(args.get("fields"))
-    sort_by = args.get("sort_by")
-
-    with STORE_LOCK:
-        data = ITEMS.copy()
-
-    # Filters
-    data = apply_filters(data, args)
-    total_after_filter = len(data)
-
-    # Sorting
-    data = apply_sort(data, sort_by)
-
-    # Pagination
-    page_data, meta = apply_pagination(data, args)
-    if include_stats:
-        meta["stats_over_page"] = compute_stats(page_data)
-        meta["stats_over_filtered"] = compute_stats(data)
-
-    # Projection
-    if fields:
-        page_data = [project_fields(x, fields) for x in page_data]
-
-    resp = make_response(jsonify({"data": page_data, "meta": meta}), 200)
-    resp.headers["X-Total-Count"] = str(total_after_filter)
-    return resp
+    return _list_pipeline(request.args.get, request.args.getlist, {})
 
 
 @app.route("/categories/<category>/items", methods=["GET"])
@@ -420,45 +1289,7 @@ def list_items_by_category(category: str):
     GET ALL #2 (different endpoint + path var)
     Same query features as /items (sorting, pagination, projection, stats), implicitly filtered by category.
     """
-    # Reuse the main list endpoint logic but force category filter
-    # Build a mutable dict of args
-    class ArgsProxy(dict):
-        def get(self, k, default=None):
-            if k == "category":
-                return category
-            return super().get(k, default)
-        def getlist(self, k):
-            val = self.get(k)
-            if isinstance(val, list):
-                return val
-            if val is None:
-                return []
-            return [val]
-
-    raw = dict(request.args)
-    args = ArgsProxy(**raw)
-    args["category"] = category  # enforce
-
-    include_stats = parse_bool(args.get("include_stats"))
-    fields = parse_fields_param(args.get("fields"))
-    sort_by = args.get("sort_by")
-
-    with STORE_LOCK:
-        data = ITEMS.copy()
-
-    data = apply_filters(data, args)
-    total_after_filter = len(data)
-    data = apply_sort(data, sort_by)
-    page_data, meta = apply_pagination(data, args)
-    if include_stats:
-        meta["stats_over_page"] = compute_stats(page_data)
-        meta["stats_over_filtered"] = compute_stats(data)
-    if fields:
-        page_data = [project_fields(x, fields) for x in page_data]
-
-    resp = make_response(jsonify({"data": page_data, "meta": meta}), 200)
-    resp.headers["X-Total-Count"] = str(total_after_filter)
-    return resp
+    return _list_pipeline(request.args.get, request.args.getlist, {"category": category})
 
 
 @app.route("/items/price/<min_price>/<max_price>", methods=["GET"])
@@ -466,52 +1297,11 @@ def list_items_by_price_range(min_price: str, max_price: str):
     """
     GET ALL #3 (extra variant): price range via path variables plus usual query features.
     """
-    # Convert and place into args override
     mn = coerce_number(min_price)
     mx = coerce_number(max_price)
     if mn is None or mx is None:
         return json_error(400, "min_price and max_price must be numeric.")
-
-    class ArgsProxy(dict):
-        def get(self, k, default=None):
-            if k == "min_price":
-                return mn
-            if k == "max_price":
-                return mx
-            return super().get(k, default)
-        def getlist(self, k):
-            val = self.get(k)
-            if isinstance(val, list):
-                return val
-            if val is None:
-                return []
-            return [val]
-
-    raw = dict(request.args)
-    args = ArgsProxy(**raw)
-    args["min_price"] = mn
-    args["max_price"] = mx
-
-    include_stats = parse_bool(args.get("include_stats"))
-    fields = parse_fields_param(args.get("fields"))
-    sort_by = args.get("sort_by")
-
-    with STORE_LOCK:
-        data = ITEMS.copy()
-
-    data = apply_filters(data, args)
-    total_after_filter = len(data)
-    data = apply_sort(data, sort_by)
-    page_data, meta = apply_pagination(data, args)
-    if include_stats:
-        meta["stats_over_page"] = compute_stats(page_data)
-        meta["stats_over_filtered"] = compute_stats(data)
-    if fields:
-        page_data = [project_fields(x, fields) for x in page_data]
-
-    resp = make_response(jsonify({"data": page_data, "meta": meta}), 200)
-    resp.headers["X-Total-Count"] = str(total_after_filter)
-    return resp
+    return _list_pipeline(request.args.get, request.args.getlist, {"min_price": mn, "max_price": mx})
 
 
 @app.route("/items/<item_id>/related", methods=["GET"])
@@ -528,17 +1318,16 @@ def related_items(item_id: str):
     sort_by = request.args.get("sort_by")
     fields = parse_fields_param(request.args.get("fields"))
 
-    with STORE_LOCK:
-        current = next((x for x in ITEMS if x["id"] == item_id), None)
-        if not current:
-            return json_error(404, "Item not found.")
-        same_cat = [x for x in ITEMS if x["category"] == current["category"] and x["id"] != item_id]
+    cols = SNAPSHOT
+    pos = cols["id_pos"].get(item_id)
+    if pos is None:
+        return json_error(404, "Item not found.")
+    category = cols["category"][pos]
 
-    same_cat = apply_sort(same_cat, sort_by or "-rating,price")
-    out = same_cat[:limit]
-    if fields:
-        out = [project_fields(x, fields) for x in out]
-    return jsonify({"base_item": {"id": current["id"], "category": current["category"]}, "related": out})
+    same_cat = np.flatnonzero((cols["category"] == category) & (cols["id"] != item_id))
+    same_cat = apply_sort(cols, sort_by or "-rating,price", same_cat, limit)
+    out = item_dicts(cols, same_cat[:limit], fields)
+    return ojsonify({"base_item": {"id": item_id, "category": category}, "related": out})
 
 
 # ----------------------------
@@ -546,6 +1335,9 @@ def related_items(item_id: str):
 # ----------------------------
 with STORE_LOCK:
     load_data()
+warm_kernels()
+threading.Thread(target=_writer_loop, name="data-writer", daemon=True).start()
+atexit.register(flush_data)
 
 
 # ----------------------------